@@ -13,6 +13,7 @@ import sysconfig
 import threading
 import traceback
 from contextlib import closing
+from itertools import chain
 
 import cffi
 import pkg_resources
@@ -29,6 +30,14 @@ logger = logging.getLogger(__name__)
 NATIVE_ENGINE_MODULE = 'native_engine'
 
 
+# Maps native log levels to the logger method that handles them: anything else is critical.
+_LOG_METHODS = {
+  0: logger.debug,
+  1: logger.info,
+  2: logger.warn,
+}
+
+
 CFFI_TYPEDEFS = '''
 typedef uint64_t   Id;
 typedef void*      Handle;
@@ -272,99 +281,95 @@ def bootstrap_c_source(output_dir, module_name=NATIVE_ENGINE_MODULE):
 def _initialize_externs(ffi):
   """Initializes extern callbacks given a CFFI handle."""
 
+  # NB: Bound once so that the externs below reach these as closure variables, rather than via an
+  # attribute lookup on every call.
+  from_handle = ffi.from_handle
+  unpack = ffi.unpack
+
+  def to_py_bytes(bytes_ptr, bytes_len):
+    return bytes(ffi.buffer(bytes_ptr, bytes_len))
+
   def to_py_str(msg_ptr, msg_len):
-    return bytes(ffi.buffer(msg_ptr, msg_len)).decode('utf-8')
+    return to_py_bytes(msg_ptr, msg_len).decode('utf-8')
 
   @ffi.def_extern()
   def extern_log(context_handle, level, msg_ptr, msg_len):
     """Given a log level and utf8 message string, log it."""
-    msg = bytes(ffi.buffer(msg_ptr, msg_len)).decode('utf-8')
-    if level == 0:
-      logger.debug(msg)
-    elif level == 1:
-      logger.info(msg)
-    elif level == 2:
-      logger.warn(msg)
-    else:
-      logger.critical(msg)
+    msg = to_py_str(msg_ptr, msg_len)
+    _LOG_METHODS.get(level, logger.critical)(msg)
 
   @ffi.def_extern()
   def extern_key_for(context_handle, val):
     """Return a Key for a Value."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     return c.to_key(c.from_value(val))
 
   @ffi.def_extern()
   def extern_val_for(context_handle, key):
     """Return a Value for a Key."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     return c.to_value(c.from_key(key))
 
   @ffi.def_extern()
   def extern_clone_val(context_handle, val):
     """Clone the given Value."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     return c.to_value(c.from_value(val))
 
   @ffi.def_extern()
   def extern_drop_handles(context_handle, handles_ptr, handles_len):
     """Drop the given Handles."""
-    c = ffi.from_handle(context_handle)
-    handles = ffi.unpack(handles_ptr, handles_len)
+    c = from_handle(context_handle)
+    handles = unpack(handles_ptr, handles_len)
     c.drop_handles(handles)
 
   @ffi.def_extern()
   def extern_id_to_str(context_handle, id_):
     """Given an Id for `obj`, write str(obj) and return it."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     return c.utf8_buf(six.text_type(c.from_id(id_)))
 
   @ffi.def_extern()
   def extern_val_to_str(context_handle, val):
     """Given a Value for `obj`, write str(obj) and return it."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     return c.utf8_buf(six.text_type(c.from_value(val)))
 
   @ffi.def_extern()
   def extern_satisfied_by(context_handle, constraint_id, val):
     """Given a TypeConstraint and a Value return constraint.satisfied_by(value)."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     return c.from_id(constraint_id.id_).satisfied_by(c.from_value(val))
 
   @ffi.def_extern()
   def extern_satisfied_by_type(context_handle, constraint_id, cls_id):
     """Given a TypeConstraint and a TypeId, return constraint.satisfied_by_type(type_id)."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     return c.from_id(constraint_id.id_).satisfied_by_type(c.from_id(cls_id.id_))
 
   @ffi.def_extern()
   def extern_store_list(context_handle, vals_ptr_ptr, vals_len, merge):
     """Given storage and an array of Values, return a new Value to represent the list."""
-    c = ffi.from_handle(context_handle)
-    vals = tuple(c.from_value(val) for val in ffi.unpack(vals_ptr_ptr, vals_len))
+    c = from_handle(context_handle)
+    from_value = c.from_value
+    vals = tuple(from_value(val) for val in unpack(vals_ptr_ptr, vals_len))
     if merge:
-      # Expect each obj to represent a list, and do a de-duping merge.
-      merged_set = set()
-      def merged():
-        for outer_val in vals:
-          for inner_val in outer_val:
-            if inner_val in merged_set:
-              continue
-            merged_set.add(inner_val)
-            yield inner_val
-      vals = tuple(merged())
+      # Expect each obj to represent a list, and do an order-preserving de-duping merge.
+      seen = set()
+      seen_add = seen.add
+      vals = tuple(v for v in chain.from_iterable(vals) if not (v in seen or seen_add(v)))
     return c.to_value(vals)
 
   @ffi.def_extern()
   def extern_store_bytes(context_handle, bytes_ptr, bytes_len):
     """Given a context and raw bytes, return a new Value to represent the content."""
-    c = ffi.from_handle(context_handle)
-    return c.to_value(bytes(ffi.buffer(bytes_ptr, bytes_len)))
+    c = from_handle(context_handle)
+    return c.to_value(to_py_bytes(bytes_ptr, bytes_len))
 
   @ffi.def_extern()
   def extern_project(context_handle, val, field_str_ptr, field_str_len, type_id):
     """Given a Value for `obj`, a field name, and a type, project the field as a new Value."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     obj = c.from_value(val)
     field_name = to_py_str(field_str_ptr, field_str_len)
     typ = c.from_id(type_id.id_)
@@ -378,7 +383,7 @@ def _initialize_externs(ffi):
   @ffi.def_extern()
   def extern_project_ignoring_type(context_handle, val, field_str_ptr, field_str_len):
     """Given a Value for `obj`, and a field name, project the field as a new Value."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     obj = c.from_value(val)
     field_name = to_py_str(field_str_ptr, field_str_len)
     projected = getattr(obj, field_name)
@@ -388,36 +393,38 @@ def _initialize_externs(ffi):
   @ffi.def_extern()
   def extern_project_multi(context_handle, val, field_str_ptr, field_str_len):
     """Given a Key for `obj`, and a field name, project the field as a list of Keys."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     obj = c.from_value(val)
     field_name = to_py_str(field_str_ptr, field_str_len)
 
-    return c.vals_buf(tuple(c.to_value(p) for p in getattr(obj, field_name)))
+    to_value = c.to_value
+    return c.vals_buf(tuple(to_value(p) for p in getattr(obj, field_name)))
 
   @ffi.def_extern()
   def extern_create_exception(context_handle, msg_ptr, msg_len):
     """Given a utf8 message string, create an Exception object."""
-    c = ffi.from_handle(context_handle)
+    c = from_handle(context_handle)
     msg = to_py_str(msg_ptr, msg_len)
     return c.to_value(Exception(msg))
 
   @ffi.def_extern()
   def extern_invoke_runnable(context_handle, func, args_ptr, args_len, cacheable):
     """Given a destructured rawRunnable, run it."""
-    c = ffi.from_handle(context_handle)
-    runnable = c.from_value(func)
-    args = tuple(c.from_value(arg) for arg in ffi.unpack(args_ptr, args_len))
+    c = from_handle(context_handle)
+    from_value = c.from_value
+    runnable = from_value(func)
+    args = tuple(from_value(arg) for arg in unpack(args_ptr, args_len))
 
     try:
       val = runnable(*args)
       is_throw = False
-      traceback_str = ''
+      traceback_buf = c.empty_buf
     except Exception as e:
       val = e
       is_throw = True
-      traceback_str = traceback.format_exc()
+      traceback_buf = c.utf8_buf(traceback.format_exc())
 
-    return RunnableComplete(c.to_value(val), is_throw, c.utf8_buf(traceback_str))
+    return RunnableComplete(c.to_value(val), is_throw, traceback_buf)
 
 
 class Value(datatype('Value', ['handle'])):
@@ -463,20 +470,26 @@ class ObjectIdMap(object):
     self._next_id = 0
 
   def put(self, obj):
-    new_id = self._next_id
-    oid = self._obj_to_id.setdefault(obj, new_id)
-    if oid is not new_id:
+    oid = self._obj_to_id.get(obj)
+    if oid is not None:
       # Object already existed.
       return oid
 
-    # Object is new/unique.
+    # Object is new/unique. NB: The object is stored by id before its id is published, so that
+    # a reader which finds the id via `get_id` can always resolve it with `get`.
+    oid = self._next_id
     self._id_to_obj[oid] = obj
+    self._obj_to_id[obj] = oid
     self._next_id += 1
     return oid
 
   def get(self, oid):
     return self._id_to_obj[oid]
 
+  def get_id(self, obj):
+    """Return the id already assigned to `obj`, or None."""
+    return self._obj_to_id.get(obj)
+
 
 class ExternContext(object):
   """A wrapper around python objects used in static extern functions in this module."""
@@ -504,6 +517,14 @@ class ExternContext(object):
     # Outstanding FFI object handles.
     self._handles = set()
 
+    # Memoized TypeIds, shared by all conversions of a type.
+    self._type_ids = dict()
+
+    # An empty Buffer, which is handed out repeatedly rather than reallocated. This is safe because
+    # the native code copies a Buffer's contents and then only drops its handle: this reference
+    # keeps the underlying array alive.
+    self.empty_buf = self.buf(b'')
+
   def buf(self, bytestring):
     buf = self._ffi.new('uint8_t[]', bytestring)
     return (buf, len(bytestring), self.to_value(buf))
@@ -533,11 +554,16 @@ class ExternContext(object):
     return self._ffi.from_handle(val.handle)
 
   def drop_handles(self, handles):
-    self._handles -= set(handles)
+    self._handles.difference_update(handles)
 
   def put(self, obj):
+    # Ids are never reassigned, so an existing id can be read without taking the lock.
+    oid = self._object_id_map.get_id(obj)
+    if oid is not None:
+      return oid
     with self._lock:
-      # If we encounter an existing id, return it.
+      # If another thread assigned an id in the meantime, this returns it. Ids are only ever
+      # assigned under the lock.
       return self._object_id_map.put(obj)
 
   def get(self, id_):
@@ -546,9 +572,14 @@ class ExternContext(object):
   def to_id(self, typ):
     return self.put(typ)
 
+  def to_type_id(self, typ):
+    type_id = self._type_ids.get(typ)
+    if type_id is None:
+      type_id = self._type_ids.setdefault(typ, TypeId(self.put(typ)))
+    return type_id
+
   def to_key(self, obj):
-    type_id = TypeId(self.put(type(obj)))
-    return Key(self.put(obj), type_id)
+    return Key(self.put(obj), self.to_type_id(type(obj)))
 
   def from_id(self, cdata):
     return self.get(cdata)
@@ -633,7 +664,7 @@ class Native(object):
                            self.ffi_lib.extern_project_multi,
                            self.ffi_lib.extern_create_exception,
                            self.ffi_lib.extern_invoke_runnable,
-                           TypeId(context.to_id(str)))
+                           context.to_type_id(str))
       return context
 
     return self.ffi.init_once(init_externs, 'ExternContext singleton')
@@ -656,7 +687,7 @@ class Native(object):
     return self.ffi.buffer(cdata)
 
   def to_ids_buf(self, types):
-    return self.context.type_ids_buf([TypeId(self.context.to_id(t)) for t in types])
+    return self.context.type_ids_buf([self.context.to_type_id(t) for t in types])
 
   def new_tasks(self):
     return self.gc(self.lib.tasks_create(), self.lib.tasks_destroy)
@@ -713,8 +744,8 @@ class Native(object):
         tc(constraint_file),
         tc(constraint_link),
         # Types.
-        TypeId(self.context.to_id(six.text_type)),
-        TypeId(self.context.to_id(six.binary_type)),
+        self.context.to_type_id(six.text_type),
+        self.context.to_type_id(six.binary_type),
         # Project tree.
         self.context.utf8_buf(build_root),
         self.context.utf8_buf(work_dir),
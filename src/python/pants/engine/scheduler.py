@@ -17,7 +17,7 @@ from pants.build_graph.address import Address
 from pants.engine.addressable import SubclassesOf
 from pants.engine.fs import FileContent, FilesContent, Path, PathGlobs, Snapshot
 from pants.engine.isolated_process import _Snapshots, create_snapshot_rules
-from pants.engine.native import Function, TypeConstraint, TypeId
+from pants.engine.native import Function, TypeConstraint
 from pants.engine.nodes import Return, State, Throw
 from pants.engine.rules import RuleIndex, SingletonRule, TaskRule
 from pants.engine.selectors import (Select, SelectDependencies, SelectProjection, SelectTransitive,
@@ -136,6 +136,9 @@ class WrappedNativeScheduler(object):
   def _to_id(self, typ):
     return self._native.context.to_id(typ)
 
+  def _to_type_id(self, typ):
+    return self._native.context.to_type_id(typ)
+
   def _to_key(self, obj):
     return self._native.context.to_key(obj)
 
@@ -214,7 +217,7 @@ class WrappedNativeScheduler(object):
       elif selector_type is SelectProjection:
         self._native.lib.tasks_add_select_projection(self._tasks,
                                                      self._to_constraint(selector.product),
-                                                     TypeId(self._to_id(selector.projected_subject)),
+                                                     self._to_type_id(selector.projected_subject),
                                                      self._to_utf8_buf(selector.field),
                                                      self._to_constraint(selector.input_product))
       else:
@@ -238,7 +241,7 @@ class WrappedNativeScheduler(object):
           yield line.rstrip()
 
   def rule_subgraph_visualization(self, root_subject_type, product_type):
-    root_type_id = TypeId(self._to_id(root_subject_type))
+    root_type_id = self._to_type_id(root_subject_type)
 
     product_type_id = TypeConstraint(self._to_id(constraint_for(product_type)))
     with temporary_file_path() as path:
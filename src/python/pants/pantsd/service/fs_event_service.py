@@ -39,6 +39,8 @@ class FSEventService(PantsService):
     self._worker_count = worker_count
     self._executor = None
     self._handlers = {}
+    # Handler name -> callback, to avoid unpacking the EventHandler on every fired event.
+    self._callbacks = {}
 
   def setup(self, lock, executor=None):
     super(FSEventService, self).setup(lock)
@@ -94,10 +96,11 @@ class FSEventService(PantsService):
       isinstance(metadata, dict) and 'fields' in metadata and 'expression' in metadata
     ), 'invalid handler metadata!'
     self._handlers[name] = Watchman.EventHandler(name=name, metadata=metadata, callback=callback)
+    self._callbacks[name] = callback
 
   def fire_callback(self, handler_name, event_data):
     """Fire an event callback for a given handler."""
-    return self._handlers[handler_name].callback(event_data)
+    return self._callbacks[handler_name](event_data)
 
   def run(self):
     """Main service entrypoint. Called via Thread.start() via PantsDaemon.run()."""
@@ -83,18 +83,19 @@ class WatchmanLauncher(object):
     )
 
   def maybe_launch(self):
-    if not self.watchman.is_alive():
+    watchman = self.watchman
+    if not watchman.is_alive():
       self._logger.debug('launching watchman')
       try:
-        self.watchman.launch()
-      except (self.watchman.ExecutionError, self.watchman.InvalidCommandOutput) as e:
+        watchman.launch()
+      except (watchman.ExecutionError, watchman.InvalidCommandOutput) as e:
         self._logger.fatal('failed to launch watchman: {!r})'.format(e))
         raise
 
     self._logger.debug('watchman is running, pid={pid} socket={socket}'
-                       .format(pid=self.watchman.pid, socket=self.watchman.socket))
+                       .format(pid=watchman.pid, socket=watchman.socket))
 
-    return self.watchman
+    return watchman
 
   def terminate(self):
     self.watchman.terminate()
@@ -7,6 +7,8 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import re
 
+from pants.util.memo import memoized
+
 
 def glob_to_regex(pattern):
   """Given a glob pattern, return an equivalent regex expression.
@@ -30,7 +32,7 @@ def glob_to_regex(pattern):
         raise ValueError('Invalid usage of "**", use "*" instead.')
 
       if not doublestar:
-        out.append('(([^/]+/)*)')
+        out.append('(?:[^/]+/)*')
         doublestar = True
     else:
       out.append(component.replace('*', '[^/]*'))
@@ -44,8 +46,17 @@ def glob_to_regex(pattern):
   return ''.join(out)
 
 
+@memoized
+def glob_to_compiled(pattern):
+  """Given a glob pattern, return a compiled regex that matches the same paths.
+
+  The result is memoized, since the same globs are matched against many paths.
+  """
+  return re.compile(glob_to_regex(pattern))
+
+
 def globs_matches(path, patterns):
-  return any(re.match(glob_to_regex(pattern), path) for pattern in patterns)
+  return any(glob_to_compiled(pattern).match(path) for pattern in patterns)
 
 
 def matches_filespec(path, spec):
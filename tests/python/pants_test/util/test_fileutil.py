@@ -9,11 +9,21 @@ import os
 import random
 import unittest
 
-from pants.util.contextutil import temporary_file, temporary_file_path
+from pants.util.contextutil import temporary_dir, temporary_file, temporary_file_path
 from pants.util.fileutil import atomic_copy, create_size_estimators
 
 
 class FileutilTest(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    # An empty file shared by the estimator tests, which only ever read it.
+    cls._empty_src_context = temporary_file_path()
+    cls._empty_src = cls._empty_src_context.__enter__()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls._empty_src_context.__exit__(None, None, None)
+
   def test_atomic_copy(self):
     with temporary_file() as src:
       src.write(src.name)
@@ -23,11 +33,33 @@ class FileutilTest(unittest.TestCase):
         dst.close()
         with open(dst.name) as new_dst:
           self.assertEquals(src.name, new_dst.read())
-        self.assertEqual(os.stat(src.name).st_mode, os.stat(dst.name).st_mode)
+          self.assertEqual(os.fstat(src.fileno()).st_mode, os.fstat(new_dst.fileno()).st_mode)
 
   def test_line_count_estimator(self):
-    with temporary_file_path() as src:
-      self.assertEqual(create_size_estimators()['linecount']([src]), 0)
+    self.assertEqual(create_size_estimators()['linecount']([self._empty_src]), 0)
+
+  def test_line_count_estimator_counts_unterminated_last_line(self):
+    with temporary_file() as terminated, temporary_file() as unterminated:
+      terminated.write(b'a\nb\n')
+      unterminated.write(b'a\nb')
+      terminated.close()
+      unterminated.close()
+      line_count = create_size_estimators()['linecount']
+      self.assertEqual(line_count([terminated.name]), 2)
+      self.assertEqual(line_count([unterminated.name]), 2)
+      self.assertEqual(line_count([terminated.name, unterminated.name]), 4)
+
+  def test_linecount_and_filesize_estimators_sum_over_sources(self):
+    with temporary_dir() as root:
+      srcs = []
+      for i in range(3):
+        src = os.path.join(root, 'src{}'.format(i))
+        with open(src, 'wb') as fp:
+          fp.write(b'line\n' * i)
+        srcs.append(src)
+      estimators = create_size_estimators()
+      self.assertEqual(estimators['linecount'](srcs), sum(range(3)))
+      self.assertEqual(estimators['filesize'](srcs), len(b'line\n') * sum(range(3)))
 
   def test_random_estimator(self):
     seedValue = 5
@@ -36,5 +68,4 @@ class FileutilTest(unittest.TestCase):
     random.seed(seedValue)
     rand = random.randint(0, 10000)
     random.seed(seedValue)
-    with temporary_file_path() as src:
-      self.assertEqual(create_size_estimators()['random']([src]), rand)
+    self.assertEqual(create_size_estimators()['random']([self._empty_src]), rand)